@@ -18,18 +18,22 @@ Senior Dev Refactor:
 """
 
 import os
+import re
+import atexit
+import sys
 import json
 import logging
-import argparse
 import time
+import heapq
+import hashlib
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
-from rich.logging import RichHandler
+# rich, plyer and argparse are imported lazily where they are used —
+# importing rich alone costs more than most commands take to run.
 
 try:
     import readchar
@@ -38,10 +42,19 @@ except ImportError:
     READCHAR_AVAILABLE = False
 
 try:
-    from plyer import notification as plyer_notification
-    PLYER_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    PLYER_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+try:
+    import fcntl    # POSIX
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt   # Windows
+except ImportError:
+    msvcrt = None
 
 # ---------------------------------------------------------------------------
 # Config & Logging
@@ -50,19 +63,59 @@ except ImportError:
 BASE_DIR = Path(__file__).parent.resolve()
 TASK_FILE = BASE_DIR / "storage.json"
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    handlers=[RichHandler(rich_tracebacks=True, show_path=False)],
-)
 logger = logging.getLogger(__name__)
 
-console = Console()
+
+def setup_logging():
+    """Rich log output on a terminal; plain lines (and no rich import) otherwise."""
+    if sys.stderr.isatty():
+        from rich.logging import RichHandler
+        handler = RichHandler(rich_tracebacks=True, show_path=False)
+    else:
+        handler = logging.StreamHandler()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[handler])
+
+
+# Same tag shape rich's markup parser recognises, e.g. [bold red] / [/dim]
+MARKUP_TAG = re.compile(r"\[[a-z#/@][^\[]*?\]")
+
+
+class LazyConsole:
+    """
+    Drop-in for rich's Console that only imports rich once something is
+    rendered to a terminal. Plain strings going to a pipe or file are
+    printed with the markup stripped, without touching rich at all.
+    """
+
+    def __init__(self):
+        self._console = None
+
+    def _get(self):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+
+    def print(self, *objects, end: str = "\n", **kwargs):
+        if not sys.stdout.isatty() and all(isinstance(o, str) for o in objects):
+            print(*(MARKUP_TAG.sub("", o) for o in objects), end=end)
+            return
+        self._get().print(*objects, end=end, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+
+console = LazyConsole()
 
 # Valid values — single source of truth
 VALID_STATUSES = {"TODO", "IN_PROGRESS", "DONE"}
 VALID_PRIORITIES = {"HIGH", "MEDIUM", "LOW"}
 DATE_FORMAT = "%Y-%m-%d %H:%M"
+REPL_BATCH_SIZE = 10       # REPL commands per journal flush
+MUTATING_COMMANDS = {"add", "complete", "status", "update", "delete", "view"}
+NOTIFY_POLL_SECONDS = 30   # Longest the notify loop ever sleeps
 
 STATUS_COLORS = {
     "TODO": "red",
@@ -82,11 +135,34 @@ PRIORITY_COLORS = {
 # ---------------------------------------------------------------------------
 
 def now_str() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
 
 
+@lru_cache(maxsize=1024)
 def parse_date(date_str: str) -> datetime:
-    """Parse date string and raise a friendly ValueError if format is wrong."""
+    """
+    Parse date string and raise a friendly ValueError if format is wrong.
+
+    Canonical "YYYY-MM-DD HH:MM" strings are sliced straight into ints;
+    anything else falls back to strptime so the accepted formats don't
+    change. Results are cached — the same end times are parsed repeatedly.
+    """
+    if (
+        len(date_str) == 16
+        and date_str[4] == date_str[7] == "-"
+        and date_str[10] == " "
+        and date_str[13] == ":"
+    ):
+        digits = date_str[0:4] + date_str[5:7] + date_str[8:10] + date_str[11:13] + date_str[14:16]
+        if digits.isascii() and digits.isdigit():
+            try:
+                return datetime(
+                    int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                    int(date_str[11:13]), int(date_str[14:16]),
+                )
+            except ValueError:
+                pass  # Out-of-range value — let strptime produce the error
+
     try:
         return datetime.strptime(date_str, DATE_FORMAT)
     except ValueError:
@@ -96,6 +172,46 @@ def parse_date(date_str: str) -> datetime:
         )
 
 
+@lru_cache(maxsize=None)
+def styled_cells() -> tuple:
+    """
+    Pre-styled rich Text cells for every status and priority, built once
+    on first use so table rows skip markup parsing.
+    """
+    from rich.text import Text
+
+    return (
+        {s: Text(s, style=c) for s, c in STATUS_COLORS.items()},
+        {p: Text(p, style=c) for p, c in PRIORITY_COLORS.items()},
+    )
+
+
+def json_dumps(obj, pretty: bool = False) -> bytes:
+    """
+    Encode to JSON bytes — orjson when installed, stdlib json otherwise.
+    orjson rejects lone surrogates (what input() makes of undecodable
+    terminal bytes); stdlib json escapes them, so those fall back to it.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except orjson.JSONEncodeError:
+            pass
+    if pretty:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def json_loads(data: bytes):
+    """Decode JSON bytes. Both backends raise json.JSONDecodeError on bad input."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # Maybe an escaped lone surrogate from json_dumps' fallback
+    return json.loads(data)
+
+
 def find_task(tasks: list, task_id: int):
     """Return task by ID or None."""
     return next((t for t in tasks if t.task_id == task_id), None)
@@ -105,7 +221,38 @@ def find_task(tasks: list, task_id: int):
 # Task Model
 # ---------------------------------------------------------------------------
 
+def _field(key: str) -> property:
+    """Task attribute stored directly in the task's backing dict."""
+    def fget(self):
+        return self._d[key]
+
+    def fset(self, value):
+        self._d[key] = value
+
+    return property(fget, fset)
+
+
+# Keys of a task row exactly as stored in storage.json
+STORAGE_KEYS = {
+    "id", "description", "status", "priority", "start_time", "end_time",
+    "reminder_enabled", "created_at", "updated_at",
+}
+
+
 class Task:
+    # One dict per task holds every field, already in storage layout, so
+    # saving never has to rebuild it and there is no per-instance __dict__.
+    __slots__ = ("_d", "_end_dt")
+
+    task_id = _field("id")
+    description = _field("description")
+    status = _field("status")
+    priority = _field("priority")
+    start_time = _field("start_time")
+    reminder_enabled = _field("reminder_enabled")
+    created_at = _field("created_at")
+    updated_at = _field("updated_at")
+
     def __init__(
         self,
         task_id: int,
@@ -118,28 +265,38 @@ class Task:
         created_at: str,
         updated_at: str,
     ):
-        self.task_id = task_id
-        self.description = description
-        self.status = status
-        self.priority = priority
-        self.start_time = start_time
-        self.end_time = end_time
-        self.reminder_enabled = reminder_enabled
-        self.created_at = created_at
-        self.updated_at = updated_at
+        self._d = {
+            "id": task_id,
+            "description": description,
+            "status": status,
+            "priority": priority,
+            "start_time": start_time,
+            "end_time": end_time,
+            "reminder_enabled": reminder_enabled,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+        self._end_dt = None
+
+    @property
+    def end_time(self) -> str:
+        return self._d["end_time"]
+
+    @end_time.setter
+    def end_time(self, value: str):
+        self._d["end_time"] = value
+        self._end_dt = None
+
+    @property
+    def end_dt(self) -> datetime:
+        """end_time parsed once and cached until it changes. Raises ValueError if invalid."""
+        if self._end_dt is None:
+            self._end_dt = parse_date(self.end_time)
+        return self._end_dt
 
     def to_dict(self) -> dict:
-        return {
-            "id": self.task_id,
-            "description": self.description,
-            "status": self.status,
-            "priority": self.priority,
-            "start_time": self.start_time,
-            "end_time": self.end_time,
-            "reminder_enabled": self.reminder_enabled,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at,
-        }
+        """Return the live backing dict (not a copy) — treat it as read-only."""
+        return self._d
 
     @classmethod
     def from_dict(cls, data: dict) -> "Task":
@@ -156,45 +313,359 @@ class Task:
             updated_at=data.get("updated_at") or data.get("updatedAt", now_str()),
         )
 
+    @classmethod
+    def from_row(cls, row: dict) -> "Task":
+        """
+        Wrap a freshly decoded storage row, adopting the dict itself as the
+        task's backing store when it is already in canonical shape — no
+        second dict per task on load. The caller must not reuse `row`.
+        Anything else (legacy keys, missing fields) goes through from_dict.
+        """
+        if row.keys() == STORAGE_KEYS and row["created_at"] and row["updated_at"]:
+            task = cls.__new__(cls)
+            task._d = row
+            task._end_dt = None
+            return task
+        return cls.from_dict(row)
+
 
 # ---------------------------------------------------------------------------
 # Task Manager
 # ---------------------------------------------------------------------------
 
 class TaskManager:
-    def __init__(self):
+    def __init__(self, pretty: bool = False):
         self.tasks: list[Task] = []
+        self._by_id: dict[int, Task] = {}   # task_id → Task, in ascending id order
+        self._index: dict[int, int] = {}    # task_id → position in self.tasks
+        self._max_id = 0          # Highest id handed out so far — never reused
+        self.pretty = pretty      # Indent storage.json snapshots for humans
+        self.autoflush = True     # False → changes are only journaled on flush()
+        self._dirty_ids: set[int] = set()   # Tasks changed since the last flush
+        self._log_fp = None       # Persistent append handle for the journal
+        self._journal_len = 0     # Records currently in the journal
+        self._last_hash = None    # Digest of the storage bytes last parsed
+        self._cached_stat = None  # _storage_signature() at the last load
+        self._load_failed = False  # Storage on disk couldn't be read — never overwrite it
+        self._lock_depth = 0      # Nesting of _storage_lock() in this process
         self.load_tasks()
 
     def load_tasks(self):
-        """Load tasks from disk. Handles missing or corrupted JSON gracefully."""
-        if not TASK_FILE.exists():
+        """
+        Load tasks from disk. Handles missing or corrupted JSON gracefully.
+
+        storage.json holds the last compacted snapshot; storage.jsonl holds
+        one record per mutation since then and is replayed on top of it.
+        If neither file changed since the last load (same mtime/size, or
+        failing that the same bytes), parsing is skipped.
+        """
+        self.flush()  # Our own buffered records must be on disk before re-reading
+        self._load()
+        if self._journal_len > 2 * len(self.tasks):
+            self.compact()
+
+    def _load(self):
+        """Re-read storage if it changed since the last load — no flushing, no compaction."""
+        # Cheapest check first: neither file touched since the last load
+        sig = self._storage_signature()
+        if sig == self._cached_stat:
             return
 
         try:
-            with open(TASK_FILE, "r") as f:
-                data = json.load(f)
-            self.tasks = [Task.from_dict(t) for t in data]
-        except json.JSONDecodeError:
-            logger.error(
-                f"storage.json is corrupted and could not be parsed. "
-                f"Starting with empty task list. Back up and fix: {TASK_FILE}"
-            )
-            self.tasks = []
+            # Under the lock, so a compaction can't land between the two reads
+            with self._storage_lock():
+                snapshot = self._read_file(TASK_FILE)
+                journal = self._read_file(TASK_FILE.with_suffix(".jsonl"))
         except Exception as e:
             logger.error(f"Unexpected error loading tasks: {e}")
             self.tasks = []
+            self._reindex()
+            self._load_failed = True
+            self._last_hash = None  # The same bytes must parse again once readable
+            return
+        self._cached_stat = sig
+
+        digest = (self._digest(snapshot), self._digest(journal))
+        if digest == self._last_hash:
+            return
+        self._last_hash = digest
+
+        self.tasks = []
+        self._load_failed = False
+        if snapshot is not None and snapshot.strip():
+            try:
+                self.tasks = [Task.from_row(t) for t in json_loads(snapshot)]
+            except json.JSONDecodeError:
+                logger.error(
+                    f"storage.json is corrupted and could not be parsed. "
+                    f"Starting with empty task list. Back up and fix: {TASK_FILE}"
+                )
+                self.tasks = []
+                self._load_failed = True
+            except Exception as e:
+                logger.error(f"Unexpected error loading tasks: {e}")
+                self.tasks = []
+                self._load_failed = True
+
+        self._reindex()
+        self._replay_journal(journal)
+        self._max_id = max(self._max_id, max(self._by_id, default=0))
+
+        # Invariant: self._by_id is in ascending id order — ids only grow and
+        # new tasks are appended — so listing never has to sort. (self.tasks
+        # loses that order once a delete swaps its tail into the hole.) Only a
+        # hand-edited or very old storage.json can break it; fix that once here.
+        if any(a.task_id > b.task_id for a, b in zip(self.tasks, self.tasks[1:])):
+            self.tasks.sort(key=lambda t: t.task_id)
+            self._reindex()
+
+    @contextmanager
+    def _storage_lock(self):
+        """
+        Hold an exclusive lock on storage.lock while touching the journal, so
+        several processes (a repl, the notifier, one-off commands) never
+        interleave appends with a compaction. Re-entrant within one manager.
+        """
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        with open(TASK_FILE.with_suffix(".lock"), "a+b") as f:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            elif msvcrt:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            self._lock_depth = 1
+            try:
+                yield
+            finally:
+                self._lock_depth = 0
+                # Closing the file releases the lock on both platforms
 
-    def save_tasks(self):
-        """Persist tasks to disk."""
+    @staticmethod
+    def _read_file(path: Path):
+        """
+        Read a whole storage file, or None if it doesn't exist. Nothing stays
+        open afterwards — Windows can't replace or delete a file that has an
+        open handle, which would block compaction. _cached_stat and
+        _last_hash already skip re-reading unchanged files.
+        """
         try:
-            with open(TASK_FILE, "w") as f:
-                json.dump([t.to_dict() for t in self.tasks], f, indent=4)
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _storage_signature(self) -> tuple:
+        """Path plus (inode, mtime, size) of the snapshot and journal — changes on any write to either."""
+        sig = [TASK_FILE]
+        for path in (TASK_FILE, TASK_FILE.with_suffix(".jsonl")):
+            try:
+                st = path.stat()
+                sig.append((st.st_ino, st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                sig.append(None)
+        return tuple(sig)
+
+    @staticmethod
+    def _digest(data):
+        return None if data is None else hashlib.blake2b(data, digest_size=8).digest()
+
+    def _reindex(self):
+        """Rebuild the id/position indexes (and id counter) from self.tasks."""
+        self._by_id = {t.task_id: t for t in self.tasks}
+        self._index = {t.task_id: i for i, t in enumerate(self.tasks)}
+        self._max_id = max(self._max_id, max(self._by_id, default=0))
+
+    def _replay_journal(self, journal: bytes):
+        """Apply journal records on top of the loaded snapshot."""
+        self._journal_len = 0
+        if not journal:
+            return
+
+        by_id = self._by_id
+        for line in journal.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json_loads(line)
+            except json.JSONDecodeError:
+                # A torn last line from an interrupted write — skip it
+                logger.warning(f"Skipping unreadable journal record in {TASK_FILE.with_suffix('.jsonl')}")
+                continue
+            try:
+                self._apply_record(by_id, record)
+            except Exception as e:
+                logger.error(f"Unexpected error replaying journal: {e}")
+                continue
+            self._journal_len += 1
+
+        self.tasks = list(by_id.values())
+        self._index = {t.task_id: i for i, t in enumerate(self.tasks)}
+
+    @staticmethod
+    def _apply_record(by_id: dict, record: dict):
+        """
+        Apply one journal record. Every op is idempotent, so replaying a
+        journal over a snapshot that already contains it is harmless.
+        """
+        op, task_id = record.get("op"), record.get("id")
+        if op == "put":
+            by_id[task_id] = Task.from_row(record["fields"])
+        elif op == "delete":
+            by_id.pop(task_id, None)
+
+    def _open_log(self):
+        """
+        Return the journal append handle, reopening it if another process
+        compacted (and so removed) the file this handle still points at.
+        """
+        path = TASK_FILE.with_suffix(".jsonl")
+        if self._log_fp is not None:
+            try:
+                current = os.stat(path).st_ino
+            except FileNotFoundError:
+                current = None
+            if current != os.fstat(self._log_fp.fileno()).st_ino:
+                self._log_fp.close()
+                self._log_fp = None
+        if self._log_fp is None:
+            self._log_fp = open(path, "ab", buffering=64 * 1024)
+        return self._log_fp
+
+    def _append_log(self, op: dict) -> bool:
+        """Append a single record to the journal — O(1) per change."""
+        try:
+            self._open_log().write(json_dumps(op) + b"\n")
+            self._journal_len += 1
+            return True
         except Exception as e:
             logger.error(f"Failed to save tasks: {e}")
+            return False
+
+    def _mark_dirty(self, task_id: int):
+        """
+        Record that a task changed. Repeated edits to the same task between
+        flushes collapse into one journal record.
+        """
+        self._dirty_ids.add(task_id)
+        if self.autoflush:
+            self.flush()
+
+    def flush(self):
+        """Journal every dirty task (or its deletion) and push it to disk."""
+        self._write_dirty()
+        if self._journal_len > 2 * len(self.tasks):
+            self.compact()
+
+    def _write_dirty(self):
+        """Append a record per dirty task and flush the journal handle."""
+        if not self._dirty_ids:
+            return
+
+        with self._storage_lock():
+            failed = set()
+            for task_id in sorted(self._dirty_ids):
+                task = self._by_id.get(task_id)
+                if task:
+                    op = {"op": "put", "id": task_id, "fields": task.to_dict()}
+                else:
+                    op = {"op": "delete", "id": task_id}
+                if not self._append_log(op):
+                    failed.add(task_id)
+            self._dirty_ids = failed  # Kept for the next flush rather than dropped
+
+            # Pushed out while still holding the lock — a compaction in another
+            # process must not remove the journal with these bytes still buffered
+            if self._log_fp is not None:
+                try:
+                    self._log_fp.flush()
+                except Exception as e:
+                    logger.error(f"Failed to save tasks: {e}")
+
+    def compact(self):
+        """
+        Fold the journal into a fresh storage.json snapshot and remove it.
+        Storage is re-read under the lock first, so records other processes
+        journaled since our last load end up in the snapshot too.
+        """
+        with self._storage_lock():
+            self._write_dirty()
+            self._cached_stat = self._last_hash = None  # Force a full re-read
+            self._load()
+            if not self.save_tasks():
+                return
+
+            if self._log_fp is not None:
+                self._log_fp.close()
+                self._log_fp = None
+            journal = TASK_FILE.with_suffix(".jsonl")
+            try:
+                journal.unlink(missing_ok=True)
+            except OSError:
+                # Windows won't delete a journal another process has open —
+                # empty it in place instead; its O_APPEND writes land at the new end
+                try:
+                    with open(journal, "r+b") as f:
+                        f.truncate()
+                except OSError as e:
+                    # The snapshot already holds every record and replay is
+                    # idempotent, so a leftover journal only costs a re-read
+                    logger.error(f"Failed to clear {journal}: {e}")
+                    return
+            self._journal_len = 0
+
+    def close(self):
+        """Release the journal handle."""
+        if self._log_fp is not None:
+            self._log_fp.close()
+            self._log_fp = None
+
+    def save_tasks(self) -> bool:
+        """
+        Persist a full snapshot of the tasks to disk.
+        Compact JSON written in a single buffered call; indented only with --pretty.
+        Refuses while the storage on disk failed to load: the in-memory list
+        is then incomplete, and the file on disk is the user's only copy.
+        """
+        if self._load_failed:
+            logger.error(f"Not overwriting {TASK_FILE}: it could not be loaded. Back up and fix it first.")
+            return False
+
+        payload = json_dumps([t.to_dict() for t in self._by_id.values()], pretty=self.pretty)
+        # Write beside the real file and rename over it: a crash mid-write
+        # leaves the previous snapshot intact instead of a truncated one.
+        tmp = TASK_FILE.with_suffix(".json.tmp")
+        try:
+            with open(tmp, "wb", buffering=65536) as f:
+                f.write(payload)
+            os.replace(tmp, TASK_FILE)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save tasks: {e}")
+            tmp.unlink(missing_ok=True)
+            return False
+
+    def _remove_task(self, task: "Task"):
+        """
+        Drop a task in O(1): move the last task into its slot and pop the
+        tail, instead of list.remove scanning (and comparing) every task.
+        """
+        del self._by_id[task.task_id]
+        i = self._index.pop(task.task_id)
+        last = self.tasks.pop()
+        if i < len(self.tasks):
+            self.tasks[i] = last
+            self._index[last.task_id] = i
 
     def get_next_id(self) -> int:
-        return max((t.task_id for t in self.tasks), default=0) + 1
+        self._max_id += 1
+        return self._max_id
 
     # -----------------------------------------------------------------------
     # Commands
@@ -215,20 +686,28 @@ class TaskManager:
             console.print(f"[bold red]✘ Invalid priority '{priority}'. Choose: HIGH, MEDIUM, LOW[/bold red]")
             return
 
-        task = Task(
-            task_id=self.get_next_id(),
-            description=description,
-            status="TODO",
-            priority=priority,
-            start_time=start_time,
-            end_time=end_time,
-            reminder_enabled=reminder,
-            created_at=now_str(),
-            updated_at=now_str(),
-        )
+        # Another process may have added tasks since we loaded: take the next
+        # id from current storage and journal the task before letting go of
+        # the lock, so no one else can hand out the same id meanwhile
+        with self._storage_lock():
+            self.load_tasks()
+            task = Task(
+                task_id=self.get_next_id(),
+                description=description,
+                status="TODO",
+                priority=priority,
+                start_time=start_time,
+                end_time=end_time,
+                reminder_enabled=reminder,
+                created_at=now_str(),
+                updated_at=now_str(),
+            )
 
-        self.tasks.append(task)
-        self.save_tasks()
+            self._index[task.task_id] = len(self.tasks)
+            self.tasks.append(task)
+            self._by_id[task.task_id] = task
+            self._dirty_ids.add(task.task_id)
+            self.flush()
         console.print(f"[bold green]✔ Task added (ID: {task.task_id}, Priority: {priority})[/bold green]")
 
     def prompt_add_task(self):
@@ -237,6 +716,8 @@ class TaskManager:
         User just runs `python main.py add` with no flags at all.
         Retries on invalid input instead of crashing.
         """
+        from rich.panel import Panel
+
         console.print(Panel(
             "[bold cyan]Let's create a new task![/bold cyan]\n[dim]Press Ctrl+C anytime to cancel.[/dim]",
             border_style="cyan",
@@ -305,16 +786,27 @@ class TaskManager:
         except KeyboardInterrupt:
             console.print("\n[dim]  Cancelled.[/dim]")
 
-    def list_tasks(self, filter_status: str = None, filter_priority: str = None):
-        tasks = self.tasks
-
-        if filter_status:
-            filter_status = filter_status.upper()
-            tasks = [t for t in tasks if t.status == filter_status]
+    def list_tasks(self, filter_status: str = None, filter_priority: str = None,
+                   output_format: str = "table"):
+        fs = filter_status.upper() if filter_status else None
+        fp = filter_priority.upper() if filter_priority else None
+        if fs or fp:
+            # Both filters in a single pass
+            tasks = [
+                t for t in self._by_id.values()
+                if (not fs or t.status == fs) and (not fp or t.priority == fp)
+            ]
+        else:
+            tasks = list(self._by_id.values())
+
+        if output_format == "json":
+            # Pretty-printed on demand — storage.json itself stays compact
+            rows = [t.to_dict() for t in tasks]  # Already in id order
+            sys.stdout.write(json_dumps(rows, pretty=True).decode() + "\n")
+            return
 
-        if filter_priority:
-            filter_priority = filter_priority.upper()
-            tasks = [t for t in tasks if t.priority == filter_priority]
+        from rich.table import Table
+        from rich.text import Text
 
         if not tasks:
             console.print("[bold red]No tasks found.[/bold red]")
@@ -330,16 +822,15 @@ class TaskManager:
         table.add_column("Reminder", justify="center")
         table.add_column("Updated At")
 
-        for task in sorted(tasks, key=lambda t: t.task_id):
-            s_color = STATUS_COLORS.get(task.status, "white")
-            p_color = PRIORITY_COLORS.get(task.priority, "white")
+        status_cells, priority_cells = styled_cells()
+        for task in tasks:  # Already in id order — see load_tasks
             reminder_icon = "🔔" if task.reminder_enabled else "—"
 
             table.add_row(
                 str(task.task_id),
                 task.description,
-                f"[{p_color}]{task.priority}[/{p_color}]",
-                f"[{s_color}]{task.status}[/{s_color}]",
+                priority_cells.get(task.priority) or Text(task.priority, style="white"),
+                status_cells.get(task.status) or Text(task.status, style="white"),
                 task.start_time,
                 task.end_time,
                 reminder_icon,
@@ -355,14 +846,14 @@ class TaskManager:
             console.print(f"[bold red]✘ Invalid status. Choose: {', '.join(VALID_STATUSES)}[/bold red]")
             return
 
-        task = find_task(self.tasks, task_id)
+        task = self._by_id.get(task_id)
         if not task:
             console.print(f"[bold red]✘ Task ID {task_id} not found.[/bold red]")
             return
 
         task.status = new_status
         task.updated_at = now_str()
-        self.save_tasks()
+        self._mark_dirty(task.task_id)
         s_color = STATUS_COLORS.get(new_status, "white")
         console.print(f"[bold green]✔ Task {task_id} → [{s_color}]{new_status}[/{s_color}][/bold green]")
 
@@ -373,49 +864,48 @@ class TaskManager:
     def update_task(self, task_id: int, description: str = None,
                     start_time: str = None, end_time: str = None,
                     priority: str = None):
-        task = find_task(self.tasks, task_id)
+        task = self._by_id.get(task_id)
         if not task:
             console.print(f"[bold red]✘ Task ID {task_id} not found.[/bold red]")
             return
 
-        if description:
-            task.description = description
-
+        # Validate everything before touching the task — a rejected update
+        # must not leave half its fields applied for the next save to persist
         if priority:
             priority = priority.upper()
             if priority not in VALID_PRIORITIES:
                 console.print(f"[bold red]✘ Invalid priority '{priority}'. Choose: HIGH, MEDIUM, LOW[/bold red]")
                 return
-            task.priority = priority
-
-        if start_time:
-            try:
+        try:
+            if start_time:
                 parse_date(start_time)
-                task.start_time = start_time
-            except ValueError as e:
-                console.print(f"[bold red]✘ {e}[/bold red]")
-                return
+            if end_time:
+                parse_date(end_time)
+        except ValueError as e:
+            console.print(f"[bold red]✘ {e}[/bold red]")
+            return
 
+        if description:
+            task.description = description
+        if priority:
+            task.priority = priority
+        if start_time:
+            task.start_time = start_time
         if end_time:
-            try:
-                parse_date(end_time)
-                task.end_time = end_time
-            except ValueError as e:
-                console.print(f"[bold red]✘ {e}[/bold red]")
-                return
+            task.end_time = end_time
 
         task.updated_at = now_str()
-        self.save_tasks()
+        self._mark_dirty(task.task_id)
         console.print(f"[bold green]✔ Task {task_id} updated.[/bold green]")
 
     def delete_task(self, task_id: int):
-        task = find_task(self.tasks, task_id)
+        task = self._by_id.get(task_id)
         if not task:
             console.print(f"[bold red]✘ Task ID {task_id} not found.[/bold red]")
             return
 
-        self.tasks.remove(task)
-        self.save_tasks()
+        self._remove_task(task)
+        self._mark_dirty(task_id)
         console.print(f"[bold yellow]🗑 Task {task_id} deleted.[/bold yellow]")
 
     def view_task(self, task_id: int):
@@ -428,7 +918,7 @@ class TaskManager:
             console.print("[bold red]✘ readchar not installed. Run: pip install readchar[/bold red]")
             return
 
-        task = find_task(self.tasks, task_id)
+        task = self._by_id.get(task_id)
         if not task:
             console.print(f"[bold red]✘ Task ID {task_id} not found.[/bold red]")
             return
@@ -436,7 +926,7 @@ class TaskManager:
         while True:
             # Always reload from disk so the card shows latest data
             self.load_tasks()
-            task = find_task(self.tasks, task_id)
+            task = self._by_id.get(task_id)
             if not task:
                 console.print(f"[bold red]✘ Task {task_id} no longer exists.[/bold red]")
                 return
@@ -453,7 +943,7 @@ class TaskManager:
                 if new_desc:
                     task.description = new_desc
                     task.updated_at = now_str()
-                    self.save_tasks()
+                    self._mark_dirty(task.task_id)
                     console.print("[bold green]✔ Description updated.[/bold green]")
                 else:
                     console.print("[dim]No changes made.[/dim]")
@@ -467,7 +957,7 @@ class TaskManager:
                 if status_key in status_map:
                     task.status = status_map[status_key]
                     task.updated_at = now_str()
-                    self.save_tasks()
+                    self._mark_dirty(task.task_id)
                     console.print(f"\n[bold green]✔ Status → {task.status}[/bold green]")
                 else:
                     console.print("\n[dim]Invalid key. No changes made.[/dim]")
@@ -481,7 +971,7 @@ class TaskManager:
                 if priority_key in priority_map:
                     task.priority = priority_map[priority_key]
                     task.updated_at = now_str()
-                    self.save_tasks()
+                    self._mark_dirty(task.task_id)
                     console.print(f"\n[bold green]✔ Priority → {task.priority}[/bold green]")
                 else:
                     console.print("\n[dim]Invalid key. No changes made.[/dim]")
@@ -514,7 +1004,7 @@ class TaskManager:
 
                 if changed:
                     task.updated_at = now_str()
-                    self.save_tasks()
+                    self._mark_dirty(task.task_id)
                     console.print("[bold green]✔ Times updated.[/bold green]")
                 else:
                     console.print("[dim]No changes made.[/dim]")
@@ -522,7 +1012,7 @@ class TaskManager:
             elif key == 'r':
                 task.reminder_enabled = not task.reminder_enabled
                 task.updated_at = now_str()
-                self.save_tasks()
+                self._mark_dirty(task.task_id)
                 state = "🔔 ON" if task.reminder_enabled else "🔕 OFF"
                 console.print(f"\n[bold green]✔ Reminder toggled → {state}[/bold green]")
 
@@ -530,8 +1020,8 @@ class TaskManager:
                 console.print("\n[bold red]⚠ Delete this task? Press 'y' to confirm, any other key to cancel.[/bold red]")
                 confirm = readchar.readkey()
                 if confirm == 'y':
-                    self.tasks.remove(task)
-                    self.save_tasks()
+                    self._remove_task(task)
+                    self._mark_dirty(task.task_id)
                     console.print("[bold yellow]🗑 Task deleted.[/bold yellow]")
                     return
                 else:
@@ -546,6 +1036,8 @@ class TaskManager:
 
     def _render_task_card(self, task: "Task"):
         """Render a beautiful detail card for a single task."""
+        from rich.panel import Panel
+
         s_color = STATUS_COLORS.get(task.status, "white")
         p_color = PRIORITY_COLORS.get(task.priority, "white")
         reminder_str = "🔔 On" if task.reminder_enabled else "🔕 Off"
@@ -572,6 +1064,9 @@ class TaskManager:
 
     def _render_menu(self):
         """Render the keypress action menu."""
+        from rich.panel import Panel
+        from rich.text import Text
+
         menu = Text()
         menu.append("\n  What would you like to do?\n\n", style="bold")
         menu.append("  [d]", style="bold yellow") ; menu.append("  Edit Description\n")
@@ -586,17 +1081,53 @@ class TaskManager:
             Panel(menu, border_style="dim", padding=(0, 2))
         )
 
+    def _reminder_heap(self, now: float) -> list:
+        """
+        Min-heap of (fire_at, kind, task_id) reminder events. Each qualifying
+        task contributes a "warn" event 60s before its end time and a "due"
+        event at its end time.
+        """
+        heap = []
+        for task in self.tasks:
+            # Skip tasks that don't qualify
+            if (
+                task.status == "DONE"
+                or not task.reminder_enabled
+                or task.end_time == "N/A"
+            ):
+                continue
+
+            try:
+                end_ts = task.end_dt.timestamp()
+            except ValueError:
+                logger.warning(
+                    f"Task ID {task.task_id} has invalid end_time: '{task.end_time}'"
+                )
+                continue
+
+            if end_ts < now - 30:
+                continue  # Past even the time's-up window
+            heap.append((end_ts - 60, "warn", task.task_id))
+            heap.append((end_ts, "due", task.task_id))
+
+        heapq.heapify(heap)
+        return heap
+
     def check_notifications(self):
         """
         Notification loop — two triggers per task:
           1. 🔔 1 minute WARNING  — fires when 0 < remaining <= 60 seconds
           2. 🔔 EXACT TIME alert  — fires when -30 <= remaining <= 0 seconds
-             (30s window handles the 30s sleep drift so we never miss exact time)
 
-        Uses two separate tracking sets so both alerts always fire independently.
-        Reloads tasks from disk every cycle so new tasks are always picked up.
+        Reminders sit in a min-heap keyed by when they fire, so the loop
+        sleeps until the next one is due. With inotify_simple installed, a
+        write to the storage files wakes it immediately; either way it also
+        wakes every NOTIFY_POLL_SECONDS to look for edits.
+        Tasks are only reloaded when storage.json / storage.jsonl change.
         """
-        if not PLYER_AVAILABLE:
+        try:
+            from plyer import notification as plyer_notification
+        except ImportError:
             console.print(
                 "[bold red]✘ plyer is not installed. Run: pip install plyer[/bold red]"
             )
@@ -609,65 +1140,99 @@ class TaskManager:
         warned_ids = set()   # Tracks tasks that got the "1 min warning"
         alerted_ids = set()  # Tracks tasks that got the "time's up" alert
 
+        heap_sig = None
+        heap = []
+        watcher = self._storage_watcher()
+
         try:
             while True:
-                self.load_tasks()
-                now = datetime.now()
-
-                for task in self.tasks:
-                    # Skip tasks that don't qualify
-                    if (
-                        task.status == "DONE"
-                        or not task.reminder_enabled
-                        or task.end_time == "N/A"
-                    ):
+                self.load_tasks()  # Returns at once unless storage changed
+                if self._cached_stat != heap_sig:
+                    heap_sig = self._cached_stat
+                    heap = self._reminder_heap(time.time())
+
+                now = time.time()
+                while heap and heap[0][0] <= now:
+                    _, kind, task_id = heapq.heappop(heap)
+                    task = self._by_id.get(task_id)
+                    if not task:
                         continue
-
-                    try:
-                        end_dt = parse_date(task.end_time)
-                        remaining = (end_dt - now).total_seconds()
-
-                        # --- Trigger 1: 1 minute warning ---
-                        if 0 < remaining <= 60 and task.task_id not in warned_ids:
-                            plyer_notification.notify(
-                                title="⏰ Task Ending Soon",
-                                message=f"'{task.description}' ends in under a minute!",
-                                timeout=10,
-                            )
-                            warned_ids.add(task.task_id)
-                            logger.info(f"[WARNING] 1-min alert sent → Task ID {task.task_id}")
-
-                        # --- Trigger 2: Exact end time ---
-                        # Window of -30s to 0s accounts for the 30s sleep cycle
-                        elif -30 <= remaining <= 0 and task.task_id not in alerted_ids:
-                            plyer_notification.notify(
-                                title="🔴 Task Time's Up",
-                                message=f"'{task.description}' has reached its end time!",
-                                timeout=15,
-                            )
-                            alerted_ids.add(task.task_id)
-                            logger.info(f"[TIME'S UP] End-time alert sent → Task ID {task.task_id}")
-
-                    except ValueError:
-                        logger.warning(
-                            f"Task ID {task.task_id} has invalid end_time: '{task.end_time}'"
+                    remaining = task.end_dt.timestamp() - now
+
+                    # --- Trigger 1: 1 minute warning ---
+                    if kind == "warn" and 0 < remaining <= 60 and task_id not in warned_ids:
+                        plyer_notification.notify(
+                            title="⏰ Task Ending Soon",
+                            message=f"'{task.description}' ends in under a minute!",
+                            timeout=10,
                         )
-
-                time.sleep(30)
+                        warned_ids.add(task_id)
+                        logger.info(f"[WARNING] 1-min alert sent → Task ID {task_id}")
+
+                    # --- Trigger 2: Exact end time ---
+                    elif kind == "due" and -30 <= remaining <= 0 and task_id not in alerted_ids:
+                        plyer_notification.notify(
+                            title="🔴 Task Time's Up",
+                            message=f"'{task.description}' has reached its end time!",
+                            timeout=15,
+                        )
+                        alerted_ids.add(task_id)
+                        logger.info(f"[TIME'S UP] End-time alert sent → Task ID {task_id}")
+
+                # Sleep until the next reminder, but never past NOTIFY_POLL_SECONDS:
+                # catches edits inotify missed, and poll() rejects timeouts over ~24.8 days
+                wait = min(heap[0][0] - time.time(), NOTIFY_POLL_SECONDS) if heap else NOTIFY_POLL_SECONDS
+                wait = max(0.0, wait)
+                if watcher:
+                    # ...or until storage is written
+                    watcher.read(timeout=int(wait * 1000))
+                else:
+                    time.sleep(wait)
 
         except KeyboardInterrupt:
             console.print("\n[bold yellow]🔔 Notification service stopped.[/bold yellow]")
+        finally:
+            if watcher:
+                watcher.close()
+
+    def _storage_watcher(self):
+        """
+        inotify watch on the directory holding storage.json (the snapshot is
+        replaced by rename, so the file itself can't be watched), or None
+        when inotify_simple isn't installed or the platform lacks inotify.
+        """
+        try:
+            from inotify_simple import INotify, flags
+        except ImportError:
+            return None
+
+        try:
+            watcher = INotify()
+            watcher.add_watch(
+                str(TASK_FILE.parent),
+                flags.MODIFY | flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.DELETE,
+            )
+        except (OSError, AttributeError) as e:  # No inotify in this libc / kernel
+            logger.warning(f"inotify unavailable, falling back to polling: {e}")
+            return None
+        return watcher
 
 
 # ---------------------------------------------------------------------------
 # CLI Entry Point
 # ---------------------------------------------------------------------------
 
-def build_parser() -> argparse.ArgumentParser:
+def build_parser() -> "argparse.ArgumentParser":
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="📋 Task Tracker CLI — Manage your tasks from the terminal.",
         formatter_class=argparse.RawTextHelpFormatter,
     )
+    parser.add_argument(
+        "--pretty", action="store_true",
+        help="Write storage.json indented (human-readable) instead of compact",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     # add
@@ -683,6 +1248,10 @@ def build_parser() -> argparse.ArgumentParser:
         "--priority", choices=["HIGH", "MEDIUM", "LOW"],
         help="Filter by priority",
     )
+    list_p.add_argument(
+        "--format", choices=["table", "json"], default="table",
+        help="Output as a table (default) or pretty-printed JSON",
+    )
 
     # complete
     comp_p = subparsers.add_parser("complete", help="Mark a task as DONE")
@@ -715,16 +1284,36 @@ def build_parser() -> argparse.ArgumentParser:
     # notify
     subparsers.add_parser("notify", help="Start the background notification service")
 
+    # repl — many commands, one process
+    subparsers.add_parser("repl", help="Interactive shell — run many commands in one session")
+
     return parser
 
 
-def main():
-    console.print("[bold cyan]🚀 Task Tracker CLI[/bold cyan]")
+def parse_args_fast(argv: list):
+    """
+    Parse the common flag-free invocations (`list`, `complete 3`, ...) straight
+    from argv without building the argparse tree. Returns None for anything
+    else — flags, --help, bad input — so the full parser can handle it.
+    """
+    if not argv or any(a.startswith("-") for a in argv):
+        return None
+
+    command, rest = argv[0], argv[1:]
+    if command in ("add", "notify", "repl") and not rest:
+        return SimpleNamespace(command=command, pretty=False)
+    if command == "list" and not rest:
+        return SimpleNamespace(
+            command=command, pretty=False, status=None, priority=None, format="table",
+        )
+    if command in ("complete", "delete", "view") and len(rest) == 1:
+        if rest[0].isascii() and rest[0].isdigit():
+            return SimpleNamespace(command=command, pretty=False, task_id=int(rest[0]))
+    return None
 
-    parser = build_parser()
-    args = parser.parse_args()
-    manager = TaskManager()
 
+def run_command(manager: TaskManager, args):
+    """Dispatch one parsed command to the manager."""
     match args.command:
         case "add":
             manager.prompt_add_task()
@@ -732,6 +1321,7 @@ def main():
             manager.list_tasks(
                 filter_status=args.status,
                 filter_priority=args.priority,
+                output_format=args.format,
             )
         case "complete":
             manager.mark_complete(args.task_id)
@@ -753,5 +1343,81 @@ def main():
             manager.check_notifications()
 
 
+def run_repl(manager: TaskManager):
+    """
+    Interactive shell — every command shares one loaded TaskManager, and
+    journal writes are flushed every REPL_BATCH_SIZE commands and on exit
+    instead of after each one. Storage is reloaded before every command
+    that edits tasks and at each flush, so the session never writes back
+    (or compacts away) a stale copy of another process's changes.
+    """
+    import shlex
+
+    parser = build_parser()
+    manager.autoflush = False
+    console.print("[dim]Type a command (e.g. list, complete 3). 'exit' or Ctrl+D to quit.[/dim]")
+
+    pending = 0
+    try:
+        while True:
+            try:
+                line = input("> ").strip()
+            except EOFError:
+                break
+            if not line:
+                continue
+            if line in ("exit", "quit"):
+                break
+
+            try:
+                args = parser.parse_args(shlex.split(line))
+            except SystemExit:
+                continue  # argparse already printed usage / help
+            except ValueError as e:
+                console.print(f"[bold red]✘ {e}[/bold red]")
+                continue
+            if args.command == "repl":
+                continue
+
+            if args.command in MUTATING_COMMANDS:
+                # Edit the rows as they are on disk now, not as they were
+                # when the session started — the stat check keeps this cheap
+                manager.load_tasks()
+            run_command(manager, args)
+            pending += 1
+            if pending >= REPL_BATCH_SIZE:
+                # Flush, then pick up whatever other processes wrote meanwhile
+                manager.load_tasks()
+                pending = 0
+    except KeyboardInterrupt:
+        console.print()
+    finally:
+        manager.flush()
+
+
+def main():
+    setup_logging()
+    args = parse_args_fast(sys.argv[1:]) or build_parser().parse_args()
+    if getattr(args, "format", "table") != "json":
+        # Keep machine-readable output clean
+        console.print("[bold cyan]🚀 Task Tracker CLI[/bold cyan]")
+
+    manager = TaskManager(pretty=args.pretty)
+    # One journal write per process, however many edits the command makes
+    manager.autoflush = False
+    # atexit runs handlers last-registered first: flush, then close
+    atexit.register(manager.close)
+    atexit.register(manager.flush)
+
+    if args.command == "repl":
+        run_repl(manager)
+    else:
+        run_command(manager, args)
+
+    if args.pretty:
+        # Explicit request — fold the journal so storage.json is readable now
+        manager.compact()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,42 +1,185 @@
+import os
+import re
+import sys
+import copy
 import json
+import time
+import tempfile
+import heapq
 import pytest
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
+from types import ModuleType, SimpleNamespace
 
 # Import everything we need to test from main
-from main import Task, TaskManager, parse_date, find_task, DATE_FORMAT, TASK_FILE
+from main import (
+    Task, TaskManager, parse_date, parse_args_fast, run_repl, find_task, DATE_FORMAT,
+    NOTIFY_POLL_SECONDS,
+)
+
+INVALID_DATE_RE = re.compile(r"Invalid date format")  # parse_date's error message
+_FMT = DATE_FORMAT  # Short alias for the strftime calls below
 
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
+# tmpfs — storage round-trips in tests stay in memory instead of hitting disk
+MEMORY_DIR = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+
+# The "now" notification tests measure against, so their windows can't drift.
+# Half past the minute, because DATE_FORMAT has minute precision: now + 30s
+# must still land on the next minute rather than truncate back to now.
+FROZEN_NOW = datetime(2025, 6, 1, 12, 0, 30)
+
+
 @pytest.fixture
-def tmp_task_file(tmp_path, monkeypatch):
+def tmp_task_file(monkeypatch):
     """
     Redirect TASK_FILE to a temp directory for every test.
     This means tests NEVER touch your real storage.json.
-    Each test gets a clean, empty file.
+    Each test gets a clean, empty file — on tmpfs where available, so the
+    real load/save code runs without any disk I/O.
     """
+    with tempfile.TemporaryDirectory(dir=MEMORY_DIR, prefix="tasktracker-") as d:
+        fake_file = Path(d) / "storage.json"
+        monkeypatch.setattr("main.TASK_FILE", fake_file)
+        yield fake_file
+
+
+@pytest.fixture
+def disk_task_file(tmp_path, monkeypatch):
+    """Like tmp_task_file, but on the real filesystem — for file-level edge cases."""
     fake_file = tmp_path / "storage.json"
     monkeypatch.setattr("main.TASK_FILE", fake_file)
     return fake_file
 
 
 @pytest.fixture
-def manager(tmp_task_file):
-    """Return a fresh TaskManager backed by a temp file."""
-    return TaskManager()
+def tmp_task_file_missing(tmp_path, monkeypatch):
+    """Point TASK_FILE at a storage file that is never created."""
+    missing = tmp_path / "nope.json"
+    monkeypatch.setattr("main.TASK_FILE", missing)
+    return missing
+
+
+@pytest.fixture(scope="session")
+def _blank_manager_template(tmp_path_factory):
+    """One empty TaskManager, loaded once against a path that never exists."""
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr("main.TASK_FILE", tmp_path_factory.mktemp("blank") / "storage.json")
+        template = TaskManager()
+    yield template
+    template.close()
+
+
+@pytest.fixture
+def manager(tmp_task_file, _blank_manager_template):
+    """Return a fresh TaskManager backed by a temp file.
+
+    Copied from the blank template instead of constructed, so tests skip the
+    constructor's load. The template's stat signature names another path, so
+    the first load_tasks() against tmp_task_file still reads from disk.
+    """
+    manager = copy.deepcopy(_blank_manager_template)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def open_manager():
+    """Factory for extra TaskManagers — a restarted app or a second process — closed after the test."""
+    managers = []
+
+    def _open():
+        managers.append(TaskManager())
+        return managers[-1]
+    yield _open
+    for m in managers:
+        m.close()
 
 
 @pytest.fixture
-def manager_with_tasks(manager):
-    """Return a TaskManager pre-loaded with 3 tasks."""
+def make_task():
+    """Factory for a reminder-enabled TODO task; override any field by keyword."""
+    def _make(**overrides):
+        fields = dict(
+            task_id=1, description="Urgent task", status="TODO", priority="HIGH",
+            start_time="2025-06-01 09:00", end_time="2025-06-01 10:00",
+            reminder_enabled=True,
+            created_at="2025-06-01 08:00:00", updated_at="2025-06-01 08:00:00",
+        )
+        fields.update(overrides)
+        return Task(**fields)
+    return _make
+
+
+@pytest.fixture(scope="module")
+def clock():
+    """End-time strings at fixed offsets from FROZEN_NOW, formatted once per module."""
+    def at(seconds):
+        return (FROZEN_NOW + timedelta(seconds=seconds)).strftime(_FMT)
+    return {"now": FROZEN_NOW, "in30": at(30), "in300": at(300), "overdue": at(-60)}
+
+
+@pytest.fixture(scope="module")
+def _base_tasks():
+    """The 3 canonical tasks — built once per module, copied into each test."""
+    ts = "2025-06-01 08:00:00"
+    return [
+        Task(1, "Task One",   "TODO", "HIGH",   "2025-06-01 09:00", "2025-06-01 10:00", False, ts, ts),
+        Task(2, "Task Two",   "TODO", "MEDIUM", "2025-06-01 10:00", "2025-06-01 11:00", True,  ts, ts),
+        Task(3, "Task Three", "TODO", "LOW",    "2025-06-01 11:00", "2025-06-01 12:00", False, ts, ts),
+    ]
+
+
+@pytest.fixture
+def manager_with_tasks(manager, _base_tasks):
+    """
+    Return a TaskManager pre-loaded with 3 tasks, written as one snapshot —
+    use manager_with_tasks_via_add when the test needs them in the journal.
+    """
+    manager.tasks = copy.deepcopy(_base_tasks)
+    manager._reindex()
+    manager.save_tasks()  # add_task reloads storage first — it must match memory
+    return manager
+
+
+@pytest.fixture
+def tasks_view(manager_with_tasks):
+    """Return (manager, {task_id: task}) for O(1) lookups in assertions.
+
+    The view holds the manager's own Task objects, so in-place edits show up
+    through it; deleted tasks do not disappear from it.
+    """
+    return manager_with_tasks, {t.task_id: t for t in manager_with_tasks.tasks}
+
+
+@pytest.fixture
+def indexed(manager_with_tasks):
+    """Return (manager, index) where index() buckets the current tasks by status and priority."""
+    def index():
+        by_status, by_priority = defaultdict(list), defaultdict(list)
+        for t in manager_with_tasks.tasks:
+            by_status[t.status].append(t)
+            by_priority[t.priority].append(t)
+        return by_status, by_priority
+    return manager_with_tasks, index
+
+
+@pytest.fixture
+def manager_with_tasks_via_add(manager):
+    """Return a TaskManager with the same 3 tasks, created (and journaled) via add_task.
+
+    Each add is journaled as it happens — add_task never defers a new id.
+    """
     manager.add_task("Task One",   "2025-06-01 09:00", "2025-06-01 10:00", False, "HIGH")
     manager.add_task("Task Two",   "2025-06-01 10:00", "2025-06-01 11:00", True,  "MEDIUM")
     manager.add_task("Task Three", "2025-06-01 11:00", "2025-06-01 12:00", False, "LOW")
-    return manager
+    yield manager
+    manager.close()
 
 
 # ---------------------------------------------------------------------------
@@ -52,17 +195,27 @@ class TestParseDate:
         assert dt.hour == 14
         assert dt.minute == 30
 
-    def test_invalid_date_raises_value_error(self):
-        with pytest.raises(ValueError, match="Invalid date format"):
-            parse_date("tomorrow")
-
-    def test_wrong_format_raises_value_error(self):
-        with pytest.raises(ValueError, match="Invalid date format"):
-            parse_date("01-06-2025 14:30")  # Day-Month-Year — wrong order
-
-    def test_empty_string_raises_value_error(self):
-        with pytest.raises(ValueError):
-            parse_date("")
+    @pytest.mark.parametrize("bad", [
+        "tomorrow",
+        "01-06-2025 14:30",   # Day-Month-Year — wrong order
+        "",
+        "not-a-date",
+        "2025-13-01 14:30",   # Month out of range
+    ])
+    def test_invalid_input_raises_value_error(self, bad):
+        with pytest.raises(ValueError, match=INVALID_DATE_RE):
+            parse_date(bad)
+
+    def test_repeated_parses_are_served_from_cache(self):
+        """The suite reuses the same few literals everywhere — each is parsed once."""
+        parse_date.cache_clear()
+        first = parse_date("2025-06-01 09:00")
+        assert parse_date("2025-06-01 09:00") is first
+        assert parse_date.cache_info().hits == 1
+
+    def test_non_padded_date_still_accepted(self):
+        """Fast path only handles the canonical form; strptime covers the rest."""
+        assert parse_date("2025-6-1 9:05") == datetime(2025, 6, 1, 9, 5)
 
 
 # ---------------------------------------------------------------------------
@@ -82,47 +235,61 @@ class TestTaskModel:
         assert d["priority"] == "HIGH"
         assert d["reminder_enabled"] is True
 
-    def test_from_dict_round_trip(self):
-        """to_dict() → from_dict() should produce an identical task."""
-        original = Task(5, "Round trip", "IN_PROGRESS", "LOW",
-                        "2025-06-01 09:00", "2025-06-01 10:00",
-                        False, "2025-01-01 00:00:00", "2025-01-01 00:00:00")
-
-        restored = Task.from_dict(original.to_dict())
-
-        assert restored.task_id == original.task_id
-        assert restored.description == original.description
-        assert restored.status == original.status
-        assert restored.priority == original.priority
-        assert restored.reminder_enabled == original.reminder_enabled
-
-    def test_from_dict_applies_defaults_for_missing_fields(self):
-        """Old JSON files without 'priority' should default to MEDIUM."""
-        minimal = {
-            "id": 1,
-            "description": "Old task",
-            "status": "TODO",
-            "createdAt": "2025-01-01 00:00:00",
-            "updatedAt": "2025-01-01 00:00:00",
-        }
-        task = Task.from_dict(minimal)
+    def test_to_dict_reflects_attribute_changes(self):
+        task = Task(1, "Test task", "TODO", "HIGH",
+                    "2025-06-01 09:00", "2025-06-01 10:00",
+                    True, "2025-06-01 08:00:00", "2025-06-01 08:00:00")
+        task.status = "DONE"
+        assert task.to_dict()["status"] == "DONE"
+        assert not hasattr(task, "__dict__")  # __slots__ — no per-instance dict
+
+    def test_end_dt_is_cached_until_end_time_changes(self):
+        task = Task(1, "Test task", "TODO", "HIGH",
+                    "2025-06-01 09:00", "2025-06-01 10:00",
+                    True, "2025-06-01 08:00:00", "2025-06-01 08:00:00")
+        assert task.end_dt == datetime(2025, 6, 1, 10, 0)
+        task.end_time = "2025-06-01 11:30"
+        assert task.end_dt == datetime(2025, 6, 1, 11, 30)
+
+    def test_from_row_adopts_canonical_rows(self):
+        row = Task(1, "Row", "TODO", "LOW", "N/A", "N/A", False,
+                   "2025-01-01 00:00:00", "2025-01-01 00:00:00").to_dict().copy()
+        assert Task.from_row(row).to_dict() is row
+
+    def test_from_row_normalises_legacy_rows(self):
+        row = {"id": 1, "description": "Old", "createdAt": "2024-01-01 00:00:00",
+               "updatedAt": "2024-01-01 00:00:00"}
+        task = Task.from_row(row)
         assert task.priority == "MEDIUM"
-        assert task.start_time == "N/A"
-        assert task.end_time == "N/A"
-        assert task.reminder_enabled is False
-
-    def test_from_dict_handles_legacy_camelcase_keys(self):
-        """Old storage.json files used createdAt/updatedAt — must still load."""
-        data = {
-            "id": 2,
-            "description": "Legacy task",
-            "status": "DONE",
-            "createdAt": "2024-01-01 00:00:00",
-            "updatedAt": "2024-06-01 00:00:00",
-        }
-        task = Task.from_dict(data)
         assert task.created_at == "2024-01-01 00:00:00"
-        assert task.updated_at == "2024-06-01 00:00:00"
+
+    @pytest.mark.parametrize("data, expected", [
+        # to_dict() → from_dict() should produce an identical task
+        (
+            Task(5, "Round trip", "IN_PROGRESS", "LOW",
+                 "2025-06-01 09:00", "2025-06-01 10:00",
+                 False, "2025-01-01 00:00:00", "2025-01-01 00:00:00").to_dict(),
+            {"task_id": 5, "description": "Round trip", "status": "IN_PROGRESS",
+             "priority": "LOW", "reminder_enabled": False},
+        ),
+        # Old JSON files without 'priority' should default to MEDIUM
+        (
+            {"id": 1, "description": "Old task", "status": "TODO",
+             "createdAt": "2025-01-01 00:00:00", "updatedAt": "2025-01-01 00:00:00"},
+            {"priority": "MEDIUM", "start_time": "N/A", "end_time": "N/A",
+             "reminder_enabled": False},
+        ),
+        # Old storage.json files used createdAt/updatedAt — must still load
+        (
+            {"id": 2, "description": "Legacy task", "status": "DONE",
+             "createdAt": "2024-01-01 00:00:00", "updatedAt": "2024-06-01 00:00:00"},
+            {"created_at": "2024-01-01 00:00:00", "updated_at": "2024-06-01 00:00:00"},
+        ),
+    ], ids=["round_trip", "missing_fields_default", "legacy_camelcase_keys"])
+    def test_from_dict(self, data, expected):
+        task = Task.from_dict(data)
+        for attr, value in expected.items():
+            assert getattr(task, attr) == value, attr
 
 
 # ---------------------------------------------------------------------------
@@ -147,56 +314,58 @@ class TestTaskManagerAdd:
     def test_ids_are_unique_and_sequential(self, manager):
         manager.add_task("Task A", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
         manager.add_task("Task B", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
-        manager.add_task("Task C", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
 
         ids = [t.task_id for t in manager.tasks]
-        assert ids == [1, 2, 3]
-        assert len(set(ids)) == 3  # All unique
-
-    def test_add_task_with_invalid_date_does_not_add(self, manager):
-        manager.add_task("Bad Task", "not-a-date", "2025-06-01 10:00", False, "LOW")
+        assert ids == [1, 2]  # Unique, in order and gap-free; no-reuse is tested separately
+
+    @pytest.mark.parametrize("start, priority", [
+        ("not-a-date",       "LOW"),      # Unparseable start time
+        ("2025-06-01 09:00", "URGENT"),   # Unknown priority
+    ])
+    def test_add_task_with_invalid_input_does_not_add(self, manager, start, priority):
+        manager.add_task("Bad Task", start, "2025-06-01 10:00", False, priority)
         assert len(manager.tasks) == 0
 
-    def test_add_task_with_invalid_priority_does_not_add(self, manager):
-        manager.add_task("Bad Task", "2025-06-01 09:00", "2025-06-01 10:00", False, "URGENT")
-        assert len(manager.tasks) == 0
-
-    def test_tasks_persist_after_reload(self, manager, tmp_task_file):
+    def test_tasks_persist_after_reload(self, open_manager, manager, tmp_task_file):
         """Tasks saved to disk should survive a fresh TaskManager load."""
         manager.add_task("Persisted Task", "2025-06-01 09:00", "2025-06-01 10:00", False, "HIGH")
 
         # Simulate restarting the app
-        reloaded = TaskManager()
+        reloaded = open_manager()
         assert len(reloaded.tasks) == 1
         assert reloaded.tasks[0].description == "Persisted Task"
 
 
 class TestTaskManagerComplete:
-    def test_mark_complete_sets_done(self, manager_with_tasks):
-        manager_with_tasks.mark_complete(1)
-        task = find_task(manager_with_tasks.tasks, 1)
+    def test_mark_complete_sets_done(self, tasks_view):
+        manager, view = tasks_view
+        manager.mark_complete(1)
+        task = view[1]
         assert task.status == "DONE"
 
     def test_mark_complete_nonexistent_id_does_not_crash(self, manager_with_tasks):
         # Should print an error, not raise an exception
         manager_with_tasks.mark_complete(999)
 
-    def test_complete_updates_updated_at(self, manager_with_tasks):
-        before = find_task(manager_with_tasks.tasks, 1).updated_at
-        manager_with_tasks.mark_complete(1)
-        after = find_task(manager_with_tasks.tasks, 1).updated_at
+    def test_complete_updates_updated_at(self, tasks_view):
+        manager, view = tasks_view
+        before = view[1].updated_at
+        manager.mark_complete(1)
+        after = view[1].updated_at
         # updated_at should have changed
         assert after >= before
 
 
 class TestTaskManagerStatus:
-    def test_set_in_progress(self, manager_with_tasks):
-        manager_with_tasks.update_status(1, "IN_PROGRESS")
-        assert find_task(manager_with_tasks.tasks, 1).status == "IN_PROGRESS"
+    def test_set_in_progress(self, tasks_view):
+        manager, view = tasks_view
+        manager.update_status(1, "IN_PROGRESS")
+        assert view[1].status == "IN_PROGRESS"
 
-    def test_invalid_status_does_not_change_task(self, manager_with_tasks):
-        manager_with_tasks.update_status(1, "STARTED")  # Invalid
-        assert find_task(manager_with_tasks.tasks, 1).status == "TODO"  # Unchanged
+    def test_invalid_status_does_not_change_task(self, tasks_view):
+        manager, view = tasks_view
+        manager.update_status(1, "STARTED")  # Invalid
+        assert view[1].status == "TODO"  # Unchanged
 
     def test_status_nonexistent_task_does_not_crash(self, manager_with_tasks):
         manager_with_tasks.update_status(999, "DONE")  # Should not raise
@@ -212,6 +381,18 @@ class TestTaskManagerDelete:
         manager_with_tasks.delete_task(999)
         assert len(manager_with_tasks.tasks) == 3  # Unchanged
 
+    def test_delete_keeps_list_and_listing_consistent(self, manager_with_tasks, capsys):
+        manager_with_tasks.delete_task(1)
+        assert sorted(t.task_id for t in manager_with_tasks.tasks) == [2, 3]
+        manager_with_tasks.delete_task(3)
+        assert [t.task_id for t in manager_with_tasks.tasks] == [2]
+
+        manager_with_tasks.add_task("Four", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
+        capsys.readouterr()
+        manager_with_tasks.list_tasks(output_format="json")
+        rows = json.loads(capsys.readouterr().out)
+        assert [r["id"] for r in rows] == [2, 4]
+
     def test_ids_of_remaining_tasks_are_unchanged(self, manager_with_tasks):
         manager_with_tasks.delete_task(2)
         ids = [t.task_id for t in manager_with_tasks.tasks]
@@ -221,18 +402,26 @@ class TestTaskManagerDelete:
 
 
 class TestTaskManagerUpdate:
-    def test_update_description(self, manager_with_tasks):
-        manager_with_tasks.update_task(1, description="Updated description")
-        assert find_task(manager_with_tasks.tasks, 1).description == "Updated description"
-
-    def test_update_priority(self, manager_with_tasks):
-        manager_with_tasks.update_task(1, priority="LOW")
-        assert find_task(manager_with_tasks.tasks, 1).priority == "LOW"
-
-    def test_update_with_invalid_date_does_not_change_task(self, manager_with_tasks):
-        original_end = find_task(manager_with_tasks.tasks, 1).end_time
-        manager_with_tasks.update_task(1, end_time="bad-date")
-        assert find_task(manager_with_tasks.tasks, 1).end_time == original_end
+    def test_update_description(self, tasks_view):
+        manager, view = tasks_view
+        manager.update_task(1, description="Updated description")
+        assert view[1].description == "Updated description"
+
+    def test_update_priority(self, tasks_view):
+        manager, view = tasks_view
+        manager.update_task(1, priority="LOW")
+        assert view[1].priority == "LOW"
+
+    def test_update_with_invalid_date_does_not_change_task(self, tasks_view):
+        manager, view = tasks_view
+        original_end = view[1].end_time
+        manager.update_task(1, end_time="bad-date")
+        assert view[1].end_time == original_end
+
+    def test_rejected_update_changes_nothing(self, tasks_view):
+        manager, view = tasks_view
+        manager.update_task(1, description="Hijacked", priority="LOW", end_time="bad-date")
+        assert (view[1].description, view[1].priority) == ("Task One", "HIGH")
 
     def test_update_nonexistent_task_does_not_crash(self, manager_with_tasks):
         manager_with_tasks.update_task(999, description="Ghost task")
@@ -243,51 +432,344 @@ class TestTaskManagerUpdate:
 # ---------------------------------------------------------------------------
 
 class TestTaskManagerFiltering:
-    def test_filter_by_status(self, manager_with_tasks, capsys):
-        manager_with_tasks.mark_complete(1)
-        done_tasks = [t for t in manager_with_tasks.tasks if t.status == "DONE"]
-        todo_tasks = [t for t in manager_with_tasks.tasks if t.status == "TODO"]
-        assert len(done_tasks) == 1
-        assert len(todo_tasks) == 2
-
-    def test_filter_by_priority(self, manager_with_tasks):
-        high = [t for t in manager_with_tasks.tasks if t.priority == "HIGH"]
-        medium = [t for t in manager_with_tasks.tasks if t.priority == "MEDIUM"]
-        low = [t for t in manager_with_tasks.tasks if t.priority == "LOW"]
-        assert len(high) == 1
-        assert len(medium) == 1
-        assert len(low) == 1
-
+    def test_filter_by_status(self, indexed):
+        manager, index = indexed
+        manager.mark_complete(1)
+        by_status, _ = index()
+        assert len(by_status["DONE"]) == 1
+        assert len(by_status["TODO"]) == 2
+
+    def test_json_format_prints_filtered_tasks(self, manager_with_tasks, capsys):
+        manager_with_tasks.list_tasks(filter_priority="LOW", output_format="json")
+        rows = json.loads(capsys.readouterr().out)
+        assert [r["description"] for r in rows] == ["Task Three"]
+
+    def test_filter_by_priority(self, indexed):
+        _, index = indexed
+        _, by_priority = index()
+        assert len(by_priority["HIGH"]) == 1
+        assert len(by_priority["MEDIUM"]) == 1
+        assert len(by_priority["LOW"]) == 1
 
 # ---------------------------------------------------------------------------
 # TaskManager — Persistence & Edge Cases
 # ---------------------------------------------------------------------------
 
+@pytest.mark.xdist_group("persistence")
 class TestTaskManagerPersistence:
-    def test_load_from_corrupted_json_does_not_crash(self, tmp_task_file):
+    def test_load_from_corrupted_json_does_not_crash(self, open_manager, disk_task_file):
         """Corrupted storage.json should result in empty task list, not a crash."""
-        tmp_task_file.write_text("{ this is not valid JSON !!!")
-        manager = TaskManager()
+        disk_task_file.write_text("{ this is not valid JSON !!!")
+        manager = open_manager()
         assert manager.tasks == []
 
-    def test_load_from_empty_file_does_not_crash(self, tmp_task_file):
-        tmp_task_file.write_text("")
-        manager = TaskManager()
+    def test_load_from_empty_file_does_not_crash(self, open_manager, disk_task_file):
+        disk_task_file.write_text("")
+        manager = open_manager()
         assert manager.tasks == []
 
-    def test_load_when_file_does_not_exist(self, tmp_task_file):
-        # Don't create the file at all
-        assert not tmp_task_file.exists()
-        manager = TaskManager()
+    def test_corrupted_snapshot_is_never_overwritten(self, open_manager, disk_task_file):
+        """A journal past the compaction threshold must not fold over an unreadable snapshot."""
+        broken = '[{"id": 1, "description": "Kept"}]x'
+        disk_task_file.write_text(broken)
+        row = Task(1, "Edited", "TODO", "LOW", "N/A", "N/A", False,
+                   "2025-01-01 00:00:00", "2025-01-01 00:00:00").to_dict()
+        with open(disk_task_file.with_suffix(".jsonl"), "w") as f:
+            for _ in range(3):
+                f.write(json.dumps({"op": "put", "id": 1, "fields": row}) + "\n")
+
+        manager = open_manager()
+        manager.add_task("New", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
+        manager.compact()
+
+        assert disk_task_file.read_text() == broken
+        assert len(disk_task_file.with_suffix(".jsonl").read_text().splitlines()) == 4
+
+    def test_storage_readable_again_is_reloaded(self, manager_with_tasks, monkeypatch):
+        """A transient read error must not stick once the same bytes read fine again."""
+        manager = manager_with_tasks  # Snapshot only — no journal to compact
+        manager.load_tasks()  # Digest of the current bytes is now cached
+        real_read = TaskManager._read_file
+        failures = iter([OSError("transient")])
+
+        def flaky(path):
+            for e in failures:
+                raise e
+            return real_read(path)
+
+        monkeypatch.setattr(TaskManager, "_read_file", staticmethod(flaky))
+        manager._cached_stat = None  # As if storage had been touched
+        manager.load_tasks()
         assert manager.tasks == []
 
-    def test_next_id_after_deletion_does_not_reuse(self, manager_with_tasks):
-        """After deleting task 3, next ID should be 4, not 3."""
-        manager_with_tasks.delete_task(3)
-        manager_with_tasks.add_task("New Task", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
-        new_task = manager_with_tasks.tasks[-1]
-        assert new_task.task_id == 4
+        manager.load_tasks()
+        assert [t.task_id for t in manager.tasks] == [1, 2, 3]
+        assert not manager._load_failed
+
+    def test_unreadable_storage_is_never_overwritten(self, open_manager, manager_with_tasks_via_add, tmp_task_file, monkeypatch):
+        manager_with_tasks_via_add.compact()
+        snapshot = tmp_task_file.read_bytes()
+
+        def fail(path):
+            raise OSError("disk on fire")
+
+        monkeypatch.setattr(TaskManager, "_read_file", staticmethod(fail))
+        manager = open_manager()
+        assert manager.tasks == []
+        manager.add_task("New", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
+        manager.compact()
+        assert tmp_task_file.read_bytes() == snapshot
+
+    def test_load_when_file_does_not_exist(self, open_manager, tmp_task_file_missing):
+        manager = open_manager()
+        assert manager.tasks == []
+
+    def test_reload_skips_parse_when_storage_unchanged(self, open_manager, manager_with_tasks_via_add):
+        manager = manager_with_tasks_via_add
+        manager.load_tasks()  # Pick up our own journal writes
+        first = manager.tasks[0]
+        manager.load_tasks()
+        assert manager.tasks[0] is first  # Same objects — nothing re-parsed
+
+        other = open_manager()
+        other.delete_task(1)
+        manager.load_tasks()
+        assert [t.task_id for t in manager.tasks] == [2, 3]
+
+    def test_unsorted_storage_is_loaded_in_id_order(self, open_manager, tmp_task_file):
+        rows = [Task(i, f"Task {i}", "TODO", "LOW", "N/A", "N/A", False,
+                     "2025-01-01 00:00:00", "2025-01-01 00:00:00").to_dict() for i in (3, 1, 2)]
+        tmp_task_file.write_text(json.dumps(rows))
+        assert [t.task_id for t in open_manager().tasks] == [1, 2, 3]
+
+    def test_stdlib_json_fallback_reads_orjson_output(self, open_manager, manager_with_tasks_via_add, monkeypatch):
+        """Storage written with orjson must still load (and append) without it installed."""
+        monkeypatch.setattr("main.ORJSON_AVAILABLE", False)
+        manager_with_tasks_via_add.update_task(1, description="Written by stdlib")
+
+        reloaded = open_manager()
+        assert [t.description for t in reloaded.tasks] == ["Written by stdlib", "Task Two", "Task Three"]
+
+    def test_next_id_after_deletion_does_not_reuse(self, manager):
+        """After deleting the only task (ID 1), the next ID should be 2, not 1."""
+        manager.add_task("Old Task", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
+        manager.delete_task(1)
+        manager.add_task("New Task", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
+        assert [t.task_id for t in manager.tasks] == [2]
+
+
+@pytest.mark.xdist_group("persistence")
+class TestTaskManagerJournal:
+    def test_mutations_append_to_journal_not_snapshot(self, manager_with_tasks, tmp_task_file):
+        """Single edits should be journaled, not rewrite the whole storage.json."""
+        snapshot = tmp_task_file.read_bytes()
+        manager_with_tasks.mark_complete(1)
+        journal = tmp_task_file.with_suffix(".jsonl")
+        assert journal.exists()
+        assert tmp_task_file.read_bytes() == snapshot
+        last = json.loads(journal.read_text().splitlines()[-1])
+        assert last["op"] == "put"
+        assert last["fields"]["status"] == "DONE"
+
+    def test_journal_replays_updates_and_deletes(self, open_manager, manager_with_tasks_via_add):
+        manager_with_tasks_via_add.update_task(1, description="Edited")
+        manager_with_tasks_via_add.delete_task(2)
+
+        reloaded = open_manager()
+        assert [t.task_id for t in reloaded.tasks] == [1, 3]
+        assert find_task(reloaded.tasks, 1).description == "Edited"
+
+    def test_compaction_folds_journal_into_snapshot(self, open_manager, manager_with_tasks_via_add, tmp_task_file):
+        manager_with_tasks_via_add.compact()
+        assert not tmp_task_file.with_suffix(".jsonl").exists()
+
+        data = json.loads(tmp_task_file.read_text())
+        assert [t["id"] for t in data] == [1, 2, 3]
+        assert len(open_manager().tasks) == 3
+
+    def test_snapshot_is_compact_unless_pretty(self, manager_with_tasks_via_add, tmp_task_file):
+        manager_with_tasks_via_add.compact()
+        assert "\n" not in tmp_task_file.read_text()
+
+        manager_with_tasks_via_add.pretty = True
+        manager_with_tasks_via_add.compact()
+        assert json.loads(tmp_task_file.read_text())[0]["id"] == 1
+        assert "\n  " in tmp_task_file.read_text()
+
+    def test_failed_snapshot_write_keeps_previous_state(self, open_manager, manager_with_tasks_via_add, tmp_task_file, monkeypatch):
+        manager_with_tasks_via_add.compact()
+        before = tmp_task_file.read_bytes()
+        manager_with_tasks_via_add.delete_task(1)
+
+        def fail(*args):
+            raise OSError("disk full")
+        with monkeypatch.context() as m:
+            m.setattr("main.os.replace", fail)
+            manager_with_tasks_via_add.compact()
+
+        assert tmp_task_file.read_bytes() == before
+        assert not tmp_task_file.with_suffix(".json.tmp").exists()
+        assert [t.task_id for t in open_manager().tasks] == [2, 3]  # Journal kept
+
+    def test_compaction_empties_a_journal_it_cannot_delete(self, open_manager, manager_with_tasks_via_add, tmp_task_file, monkeypatch):
+        """As on Windows, where another process holding the journal open blocks unlink."""
+        def locked(self, missing_ok=False):
+            raise PermissionError("in use by another process")
+        with monkeypatch.context() as m:
+            m.setattr(Path, "unlink", locked)
+            manager_with_tasks_via_add.compact()
+
+        assert tmp_task_file.with_suffix(".jsonl").read_bytes() == b""
+        assert [t.task_id for t in open_manager().tasks] == [1, 2, 3]
+
+    def test_batched_records_reach_disk_on_flush(self, manager_with_tasks_via_add, tmp_task_file):
+        manager = manager_with_tasks_via_add
+        manager.autoflush = False
+        manager.update_task(1, description="Buffered")
+        journal = tmp_task_file.with_suffix(".jsonl")
+        assert len(journal.read_bytes().splitlines()) == 3
+
+        manager.flush()
+        assert len(journal.read_bytes().splitlines()) == 4
+
+    def test_undecodable_input_survives_a_round_trip(self, open_manager, manager):
+        """input() turns undecodable terminal bytes into lone surrogates — orjson rejects them."""
+        manager.add_task("bad \udcff byte", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
+        manager.compact()
+        manager.update_task(1, priority="HIGH")
+        assert open_manager().tasks[0].description == "bad \udcff byte"
+
+    def test_failed_append_keeps_the_task_dirty(self, open_manager, manager_with_tasks_via_add, monkeypatch):
+        manager = manager_with_tasks_via_add
+
+        def fail(self):
+            raise OSError("disk full")
+        with monkeypatch.context() as m:
+            m.setattr(TaskManager, "_open_log", fail)
+            manager.update_task(1, description="Retry me")
+        assert manager._dirty_ids == {1}
+
+        manager.flush()
+        assert open_manager().tasks[0].description == "Retry me"
+
+    def test_add_is_journaled_at_once_even_when_batching(self, manager, tmp_task_file):
+        """New ids must reach disk before another process can hand out the same one."""
+        manager.autoflush = False
+        manager.add_task("Added", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
+        assert len(tmp_task_file.with_suffix(".jsonl").read_bytes().splitlines()) == 1
+
+    def test_repeated_edits_coalesce_into_one_record(self, open_manager, manager_with_tasks_via_add, tmp_task_file):
+        manager = manager_with_tasks_via_add
+        journal = tmp_task_file.with_suffix(".jsonl")
+        before = len(journal.read_bytes().splitlines())
+
+        manager.autoflush = False
+        manager.update_status(1, "IN_PROGRESS")
+        manager.update_task(1, description="Renamed")
+        manager.mark_complete(1)
+        manager.flush()
+
+        assert len(journal.read_bytes().splitlines()) == before + 1
+        task = find_task(open_manager().tasks, 1)
+        assert (task.status, task.description) == ("DONE", "Renamed")
+
+    def test_torn_journal_line_is_skipped(self, open_manager, manager_with_tasks_via_add, tmp_task_file):
+        with open(tmp_task_file.with_suffix(".jsonl"), "a") as f:
+            f.write('{"op":"delete","id"')
+        reloaded = open_manager()
+        assert len(reloaded.tasks) == 3
+
+    def test_writes_after_another_process_compacts_reach_disk(self, open_manager, manager_with_tasks_via_add):
+        """A long-lived session's journal handle must follow a compaction elsewhere."""
+        manager = manager_with_tasks_via_add
+        manager.update_task(1, description="Edited")
+        open_manager().compact()  # Another process folds and removes the journal
+
+        manager.update_task(1, description="Edited again")
+        manager.add_task("Four", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
+        descriptions = [t.description for t in open_manager().tasks]
+        assert descriptions == ["Edited again", "Task Two", "Task Three", "Four"]
+
+    def test_compaction_keeps_other_processes_records(self, open_manager, manager_with_tasks_via_add):
+        other = open_manager()
+        other.add_task("From elsewhere", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
+
+        manager_with_tasks_via_add.compact()  # Never reloaded since the other add
+        assert [t.task_id for t in open_manager().tasks] == [1, 2, 3, 4]
+
+
+# ---------------------------------------------------------------------------
+# CLI Fast-Path Parsing
+# ---------------------------------------------------------------------------
 
+class TestParseArgsFast:
+    def test_simple_commands_skip_argparse(self):
+        assert parse_args_fast(["list"]).command == "list"
+        args = parse_args_fast(["complete", "3"])
+        assert (args.command, args.task_id) == ("complete", 3)
+
+    @pytest.mark.parametrize("argv", [
+        [], ["--help"], ["list", "--status", "DONE"], ["delete", "abc"],
+        ["status", "1", "DONE"], ["update", "1"], ["--pretty", "list"],
+    ])
+    def test_everything_else_falls_back(self, argv):
+        assert parse_args_fast(argv) is None
+
+
+class TestRepl:
+    def test_repl_runs_commands_and_flushes_on_exit(self, open_manager, manager_with_tasks, monkeypatch):
+        lines = iter(["complete 1", "delete 99", "not-a-command", "", "delete 2"])
+
+        def fake_input(prompt=""):
+            try:
+                return next(lines)
+            except StopIteration:
+                raise EOFError
+        monkeypatch.setattr("builtins.input", fake_input)
+
+        run_repl(manager_with_tasks)
+        reloaded = open_manager()
+        assert find_task(reloaded.tasks, 1).status == "DONE"
+        assert find_task(reloaded.tasks, 2) is None
+
+    def test_repl_never_writes_back_stale_rows_or_ids(self, open_manager, manager_with_tasks_via_add, monkeypatch):
+        """Outside edits land mid-batch (default REPL_BATCH_SIZE) and must all survive."""
+        other = open_manager()
+
+        def complete_2_elsewhere():
+            other.add_task("From elsewhere", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
+            other.mark_complete(2)
+            return "update 2 --description Renamed"
+
+        def add_elsewhere_mid_prompt():
+            other.add_task("Also elsewhere", "2025-06-01 09:00", "2025-06-01 10:00", False, "LOW")
+            return "Mine"
+
+        lines = iter([
+            lambda: "complete 1",
+            complete_2_elsewhere,
+            lambda: "add",
+            add_elsewhere_mid_prompt,
+            *(lambda s=s: s for s in ("2025-06-01 09:00", "2025-06-01 10:00", "l", "n", "y")),
+        ])
+
+        def fake_input(prompt=""):
+            try:
+                return next(lines)()
+            except StopIteration:
+                raise EOFError
+        monkeypatch.setattr("builtins.input", fake_input)
+
+        run_repl(manager_with_tasks_via_add)
+        rows = [(t.task_id, t.description, t.status) for t in open_manager().tasks]
+        assert rows == [
+            (1, "Task One", "DONE"),
+            (2, "Renamed", "DONE"),
+            (3, "Task Three", "TODO"),
+            (4, "From elsewhere", "TODO"),
+            (5, "Also elsewhere", "TODO"),
+            (6, "Mine", "TODO"),
+        ]
 
 # ---------------------------------------------------------------------------
 # Notification Logic Tests
@@ -299,48 +781,76 @@ class TestNotificationLogic:
     We don't test the actual OS notification popup — that's an external side effect.
     """
 
-    def _tasks_due_within(self, seconds: int) -> list:
-        """Helper: build a task whose end_time is `seconds` from now."""
-        end_time = (datetime.now() + timedelta(seconds=seconds)).strftime(DATE_FORMAT)
-        return [Task(1, "Urgent task", "TODO", "HIGH",
-                     "2025-06-01 09:00", end_time, True,
-                     "2025-06-01 08:00:00", "2025-06-01 08:00:00")]
-
-    def test_task_due_in_30_seconds_should_notify(self):
-        tasks = self._tasks_due_within(30)
-        task = tasks[0]
-        end_dt = parse_date(task.end_time)
-        remaining = (end_dt - datetime.now()).total_seconds()
-        assert 0 < remaining <= 60  # Should trigger notification window
-
-    def test_task_due_in_5_minutes_should_not_notify(self):
-        tasks = self._tasks_due_within(300)
-        task = tasks[0]
-        end_dt = parse_date(task.end_time)
-        remaining = (end_dt - datetime.now()).total_seconds()
-        assert remaining > 60  # Outside notification window
-
-    def test_completed_task_should_not_notify(self):
-        end_time = (datetime.now() + timedelta(seconds=30)).strftime(DATE_FORMAT)
-        task = Task(1, "Done task", "DONE", "HIGH",
-                    "2025-06-01 09:00", end_time, True,
-                    "2025-06-01 08:00:00", "2025-06-01 08:00:00")
-        # DONE tasks should be excluded from notifications
-        assert task.status == "DONE"  # Notification loop checks this
-
-    def test_task_without_reminder_should_not_notify(self):
-        end_time = (datetime.now() + timedelta(seconds=30)).strftime(DATE_FORMAT)
-        task = Task(1, "No reminder", "TODO", "HIGH",
-                    "2025-06-01 09:00", end_time, False,  # reminder_enabled = False
-                    "2025-06-01 08:00:00", "2025-06-01 08:00:00")
-        assert task.reminder_enabled is False
-
-    def test_overdue_task_should_not_notify(self):
-        """Tasks already past their end time (remaining <= 0) should NOT notify."""
-        end_time = (datetime.now() - timedelta(seconds=60)).strftime(DATE_FORMAT)
-        task = Task(1, "Overdue task", "TODO", "HIGH",
-                    "2025-06-01 09:00", end_time, True,
-                    "2025-06-01 08:00:00", "2025-06-01 08:00:00")
-        end_dt = parse_date(task.end_time)
-        remaining = (end_dt - datetime.now()).total_seconds()
-        assert remaining <= 0  # Notification loop: `if 0 < remaining <= 60` → False
\ No newline at end of file
+    @pytest.mark.parametrize("when, status, reminder, expect_notify", [
+        ("in30",    "TODO", True,  True),    # Due within the 1-minute window
+        ("in300",   "TODO", True,  False),   # 5 minutes out — outside the window
+        ("in30",    "DONE", True,  False),   # DONE tasks are excluded
+        ("in30",    "TODO", False, False),   # reminder_enabled = False
+        ("overdue", "TODO", True,  False),   # Overdue — remaining <= 0
+    ])
+    def test_notification_window(self, make_task, clock, when, status, reminder, expect_notify):
+        task = make_task(status=status, reminder_enabled=reminder, end_time=clock[when])
+
+        remaining = (task.end_dt - clock["now"]).total_seconds()
+        # Same checks the notification loop makes before the 1-minute alert
+        should_notify = (
+            task.status != "DONE" and task.reminder_enabled and 0 < remaining <= 60
+        )
+        assert should_notify is expect_notify
+
+    def test_reminder_heap_orders_events_and_skips_ineligible(self, manager):
+        soon = (datetime.now() + timedelta(minutes=10)).strftime(_FMT)
+        later = (datetime.now() + timedelta(minutes=20)).strftime(_FMT)
+        manager.add_task("Later",  "2025-06-01 09:00", later, True,  "LOW")
+        manager.add_task("Soon",   "2025-06-01 09:00", soon,  True,  "LOW")
+        manager.add_task("Silent", "2025-06-01 09:00", soon,  False, "LOW")
+        manager.add_task("Done",   "2025-06-01 09:00", soon,  True,  "LOW")
+        manager.mark_complete(4)
+
+        heap = manager._reminder_heap(time.time())
+        events = [heapq.heappop(heap)[1:] for _ in range(len(heap))]
+        assert events == [("warn", 2), ("due", 2), ("warn", 1), ("due", 1)]
+
+    def test_notify_loop_fires_each_alert_once_and_caps_waits(self, manager, open_manager, monkeypatch):
+        """
+        Drives check_notifications with a fake clock, watcher and plyer:
+        task 1 ends 90s in, task 2 a month out (past poll()'s ~24.8-day timeout
+        limit), and task 3 is added by another process mid-run.
+        """
+        t0 = FROZEN_NOW.timestamp()
+        now = [t0]
+        monkeypatch.setattr("main.time", SimpleNamespace(
+            time=lambda: now[0], strftime=time.strftime, localtime=time.localtime,
+        ))
+
+        sent = []
+        plyer = ModuleType("plyer")
+        plyer.notification = SimpleNamespace(notify=lambda title, message, timeout: sent.append((title, message)))
+        monkeypatch.setitem(sys.modules, "plyer", plyer)
+
+        manager.add_task("Soon",  "2025-06-01 09:00", "2025-06-01 12:02", True, "LOW")   # t0 + 90
+        manager.add_task("Month", "2025-06-01 09:00", "2025-07-01 12:00", True, "LOW")
+        waits = []
+
+        class FakeWatcher:
+            def read(self, timeout):
+                waits.append(timeout)
+                now[0] += timeout / 1000
+                if len(waits) == 4:  # Written while the loop sleeps
+                    open_manager().add_task("Later", "2025-06-01 09:00", "2025-06-01 12:04", True, "LOW")  # t0 + 210
+                if now[0] >= t0 + 300:
+                    raise KeyboardInterrupt
+
+            def close(self):
+                pass
+
+        monkeypatch.setattr(manager, "_storage_watcher", lambda: FakeWatcher())
+        manager.check_notifications()
+
+        assert sent == [
+            ("⏰ Task Ending Soon", "'Soon' ends in under a minute!"),
+            ("🔴 Task Time's Up", "'Soon' has reached its end time!"),
+            ("⏰ Task Ending Soon", "'Later' ends in under a minute!"),   # Heap rebuilt after the write
+            ("🔴 Task Time's Up", "'Later' has reached its end time!"),
+        ]
+        assert max(waits) == NOTIFY_POLL_SECONDS * 1000